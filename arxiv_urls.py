@@ -0,0 +1,35 @@
+"""
+Canonical paper URLs. Paper records are keyed by these, so every code path
+that reads or writes the papers table normalizes URLs the same way.
+"""
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Matches /abs/, /pdf/ and /html/ paths, dropping version and .pdf suffixes
+ARXIV_PATH_PATTERN = re.compile(r'^/(?:abs|pdf|html)/(.+?)(?:v\d+)?(?:\.pdf)?$')
+# Query parameters that only track where a link came from
+TRACKING_PARAMS = {'fbclid', 'gclid', 'mc_cid', 'mc_eid'}
+
+def normalize_arxiv_url(url: str) -> str:
+    """
+    Canonicalize a paper URL so trivially different links share one record.
+    ArXiv links become https://arxiv.org/abs/<id> (no version); other URLs
+    lose their fragment, trailing slash and tracking parameters (utm_* etc.).
+    """
+    url = url.strip()
+    parts = urlsplit(url)
+    if not parts.netloc:
+        # Scheme-less input such as "arxiv.org/abs/2401.12345"
+        parts = urlsplit(f"https://{url}")
+    host = parts.netloc.lower()
+    path = parts.path.rstrip('/')
+    if host in ('arxiv.org', 'www.arxiv.org', 'export.arxiv.org'):
+        match = ARXIV_PATH_PATTERN.match(path)
+        if match:
+            return f"https://arxiv.org/abs/{match.group(1)}"
+    query = urlencode([
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    ])
+    return urlunsplit((parts.scheme.lower() or 'https', host, path, query, ''))
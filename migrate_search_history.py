@@ -0,0 +1,174 @@
+"""
+One-off migration for the search history index and saved paper flags.
+
+get_search_history queries the 'by_timestamp' global secondary index
+(partition key entity_type, sort key timestamp) on the 'searches' table.
+This script creates that index if it is missing and backfills entity_type
+and result_count on search records written before the index existed, so
+they show up in history again.
+
+Paper records are keyed by normalize_arxiv_url(url). Records stored under
+an older, non-canonical URL (versioned, /pdf/, tracking parameters) are
+merged into their canonical record, keeping any summary, and deleted.
+Run it before starting servers that use canonical URLs, since a server
+still writing old-style URLs would keep creating records to merge.
+
+get_saved_papers reads has_summary instead of transferring summaries, so
+paper records written before that flag existed get it backfilled from
+whether they have a summary. It is safe to run more than once.
+
+    uv run migrate_search_history.py
+"""
+import os
+import time
+
+import boto3
+from dotenv import load_dotenv
+
+from arxiv_urls import normalize_arxiv_url
+
+if os.path.exists('.env'):
+    load_dotenv()
+
+INDEX_NAME = 'by_timestamp'
+
+dynamodb_config = {
+    'region_name': os.environ.get("AWS_REGION", "us-east-1"),
+    'aws_access_key_id': os.environ.get("AWS_ACCESS_KEY_ID"),
+    'aws_secret_access_key': os.environ.get("AWS_SECRET_ACCESS_KEY")
+}
+if os.environ.get("DYNAMODB_ENDPOINT"):
+    dynamodb_config['endpoint_url'] = os.environ["DYNAMODB_ENDPOINT"]
+
+dynamodb = boto3.resource('dynamodb', **dynamodb_config)
+searches_table = dynamodb.Table('searches')
+papers_table = dynamodb.Table('papers')
+
+def create_index():
+    """Create the by_timestamp index and wait until it is active."""
+    table = dynamodb.meta.client.describe_table(TableName='searches')['Table']
+    indexes = {i['IndexName']: i for i in table.get('GlobalSecondaryIndexes', [])}
+    if INDEX_NAME not in indexes:
+        index = {
+            'IndexName': INDEX_NAME,
+            'KeySchema': [
+                {'AttributeName': 'entity_type', 'KeyType': 'HASH'},
+                {'AttributeName': 'timestamp', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        }
+        # Provisioned tables need throughput for the new index as well
+        if table.get('BillingModeSummary', {}).get('BillingMode') != 'PAY_PER_REQUEST':
+            throughput = table['ProvisionedThroughput']
+            index['ProvisionedThroughput'] = {
+                'ReadCapacityUnits': throughput['ReadCapacityUnits'],
+                'WriteCapacityUnits': throughput['WriteCapacityUnits']
+            }
+        dynamodb.meta.client.update_table(
+            TableName='searches',
+            AttributeDefinitions=[
+                {'AttributeName': 'entity_type', 'AttributeType': 'S'},
+                {'AttributeName': 'timestamp', 'AttributeType': 'S'}
+            ],
+            GlobalSecondaryIndexUpdates=[{'Create': index}]
+        )
+        print(f"🔧 Creating '{INDEX_NAME}' index on 'searches'...")
+
+    while indexes.get(INDEX_NAME, {}).get('IndexStatus') != 'ACTIVE':
+        time.sleep(10)
+        table = dynamodb.meta.client.describe_table(TableName='searches')['Table']
+        indexes = {i['IndexName']: i for i in table.get('GlobalSecondaryIndexes', [])}
+    print(f"✅ '{INDEX_NAME}' index is active")
+
+def backfill_searches():
+    """Add entity_type and result_count to search records that lack them."""
+    scan_kwargs = {
+        'ProjectionExpression': 'search_id, entity_type, result_count, results'
+    }
+    updated = 0
+    while True:
+        response = searches_table.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            if 'entity_type' in item and 'result_count' in item:
+                continue
+            searches_table.update_item(
+                Key={'search_id': item['search_id']},
+                UpdateExpression='SET entity_type = :type, result_count = :count',
+                ExpressionAttributeValues={
+                    ':type': 'search',
+                    ':count': len(item.get('results', []))
+                }
+            )
+            updated += 1
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    print(f"✅ Backfilled {updated} search records")
+
+def merge_papers(canonical: dict, legacy: dict) -> dict:
+    """
+    Merge a legacy paper record into its canonical one. The canonical
+    record wins, except that a missing summary or placeholder title is
+    taken from the legacy record and the earliest timestamp is kept.
+    """
+    merged = {**legacy, **canonical}
+    if not canonical.get('summary') and legacy.get('summary'):
+        merged['summary'] = legacy['summary']
+    if canonical.get('title', 'Unknown Title') == 'Unknown Title' and legacy.get('title'):
+        merged['title'] = legacy['title']
+    timestamps = [r['timestamp'] for r in (canonical, legacy) if r.get('timestamp')]
+    if timestamps:
+        merged['timestamp'] = min(timestamps)
+    merged['has_summary'] = bool(merged.get('summary'))
+    return merged
+
+def migrate_paper_urls():
+    """Move paper records stored under non-canonical URLs to canonical ones."""
+    scan_kwargs = {}
+    migrated = 0
+    while True:
+        response = papers_table.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            url = normalize_arxiv_url(item['url'])
+            if url == item['url']:
+                continue
+            canonical = papers_table.get_item(
+                Key={'url': url}, ConsistentRead=True
+            ).get('Item', {})
+            papers_table.put_item(Item={**merge_papers(canonical, item), 'url': url})
+            papers_table.delete_item(Key={'url': item['url']})
+            migrated += 1
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    print(f"✅ Merged {migrated} paper records into canonical URLs")
+
+def backfill_papers():
+    """Set has_summary on paper records where it is missing or out of date."""
+    scan_kwargs = {
+        'ProjectionExpression': '#u, summary, has_summary',
+        'ExpressionAttributeNames': {'#u': 'url'}
+    }
+    updated = 0
+    while True:
+        response = papers_table.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            has_summary = bool(item.get('summary'))
+            if item.get('has_summary') == has_summary:
+                continue
+            papers_table.update_item(
+                Key={'url': item['url']},
+                UpdateExpression='SET has_summary = :has_summary',
+                ExpressionAttributeValues={':has_summary': has_summary}
+            )
+            updated += 1
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    print(f"✅ Backfilled has_summary on {updated} paper records")
+
+if __name__ == "__main__":
+    create_index()
+    backfill_searches()
+    migrate_paper_urls()
+    backfill_papers()
@@ -1,13 +1,30 @@
+import asyncio
+import atexit
+import hashlib
+import json
+import math
 import os
-from datetime import datetime
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from itertools import groupby
+from typing import Dict, List, Optional, Tuple
+from dataclasses import asdict, dataclass
 
 import boto3
+import httpx
+from botocore.config import Config as BotoConfig
+from botocore.exceptions import ClientError
+from boto3.dynamodb.conditions import Key
 from fastmcp import FastMCP
-from tavily import TavilyClient
+from fastmcp.exceptions import ToolError
 from dotenv import load_dotenv
 
+from arxiv_urls import normalize_arxiv_url
+
 # Only load .env file if it exists (for local development)
 if os.path.exists('.env'):
     load_dotenv()
@@ -16,34 +33,84 @@ else:
     print("✅ No .env file found - using environment variables from runtime")
 
 # --- Configuration ---
-TAVILY_API_KEY = os.environ.get("TAVILY_API_KEY")
-if not TAVILY_API_KEY:
-    raise ValueError("Please set the TAVILY_API_KEY environment variable.")
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Runtime settings, read from the environment once at startup."""
+    tavily_api_key: str
+    aws_region: str
+    dynamodb_endpoint: Optional[str]  # Only set for local development
+    dax_endpoint: Optional[str]  # Optional DAX cluster, e.g. dax://my-cluster...
+    aws_access_key_id: Optional[str]
+    aws_secret_access_key: Optional[str]
 
-# DynamoDB Configuration
-AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
-DYNAMODB_ENDPOINT = os.environ.get("DYNAMODB_ENDPOINT")  # Only set for local development
+CONFIG = Config(
+    tavily_api_key=os.environ.get("TAVILY_API_KEY"),
+    aws_region=os.environ.get("AWS_REGION", "us-east-1"),
+    dynamodb_endpoint=os.environ.get("DYNAMODB_ENDPOINT"),
+    dax_endpoint=os.environ.get("DAX_ENDPOINT"),
+    aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID"),
+    aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY")
+)
+if not CONFIG.tavily_api_key:
+    raise ValueError("Please set the TAVILY_API_KEY environment variable.")
 
 # Check DynamoDB endpoint configuration
-if DYNAMODB_ENDPOINT:
-    print(f"🔧 Using DynamoDB Local endpoint: {DYNAMODB_ENDPOINT}")
+if CONFIG.dax_endpoint:
+    print(f"🔧 Using DynamoDB Accelerator (DAX) endpoint: {CONFIG.dax_endpoint}")
+elif CONFIG.dynamodb_endpoint:
+    print(f"🔧 Using DynamoDB Local endpoint: {CONFIG.dynamodb_endpoint}")
 else:
     print("🔧 Using AWS DynamoDB service (production mode)")
 
+class AsyncTavily:
+    """
+    Minimal async Tavily client. All calls share one pooled HTTP/2 client, so
+    concurrent requests multiplex over a single TLS connection.
+    """
+
+    def __init__(self, api_key: str):
+        self.http = httpx.AsyncClient(
+            base_url="https://api.tavily.com",
+            http2=True,
+            timeout=60,
+            headers={"Authorization": f"Bearer {api_key}"}
+        )
+
+    async def _search(self, **payload) -> Dict:
+        response = await self.http.post("/search", json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    async def search(self, query: str, max_results: int = 5) -> Dict:
+        return await self._search(query=query, max_results=max_results)
+
+    async def qna_search(self, query: str) -> str:
+        response = await self._search(
+            query=query,
+            search_depth="advanced",
+            include_answer=True,
+            max_results=5
+        )
+        return response.get("answer", "")
+
+    async def aclose(self):
+        await self.http.aclose()
+
 # Initialize clients
-tavily = TavilyClient(api_key=TAVILY_API_KEY)
+tavily = AsyncTavily(api_key=CONFIG.tavily_api_key)
 mcp = FastMCP(name="ArxivExplorer")
 
 # Initialize DynamoDB with conditional endpoint
-dynamodb_config = {
-    'region_name': AWS_REGION,
-    'aws_access_key_id': os.environ.get("AWS_ACCESS_KEY_ID"),
-    'aws_secret_access_key': os.environ.get("AWS_SECRET_ACCESS_KEY")
+session_config = {
+    'region_name': CONFIG.aws_region,
+    'aws_access_key_id': CONFIG.aws_access_key_id,
+    'aws_secret_access_key': CONFIG.aws_secret_access_key
 }
+dynamodb_config = {}
 
 # Only add endpoint_url if DYNAMODB_ENDPOINT is set (for local development)
-if DYNAMODB_ENDPOINT:
-    dynamodb_config['endpoint_url'] = DYNAMODB_ENDPOINT
+if CONFIG.dynamodb_endpoint:
+    dynamodb_config['endpoint_url'] = CONFIG.dynamodb_endpoint
 
 # --- Database Setup ---
 # def setup_database():
@@ -73,7 +140,20 @@ if DYNAMODB_ENDPOINT:
 #                 {'AttributeName': 'search_id', 'KeyType': 'HASH'}
 #             ],
 #             AttributeDefinitions=[
-#                 {'AttributeName': 'search_id', 'AttributeType': 'S'}
+#                 {'AttributeName': 'search_id', 'AttributeType': 'S'},
+#                 {'AttributeName': 'entity_type', 'AttributeType': 'S'},
+#                 {'AttributeName': 'timestamp', 'AttributeType': 'S'}
+#             ],
+#             GlobalSecondaryIndexes=[
+#                 {
+#                     # Lets get_search_history query the newest searches directly
+#                     'IndexName': 'by_timestamp',
+#                     'KeySchema': [
+#                         {'AttributeName': 'entity_type', 'KeyType': 'HASH'},
+#                         {'AttributeName': 'timestamp', 'KeyType': 'RANGE'}
+#                     ],
+#                     'Projection': {'ProjectionType': 'ALL'}
+#                 }
 #             ],
 #             BillingMode='PAY_PER_REQUEST'
 #         )
@@ -85,159 +165,628 @@ if DYNAMODB_ENDPOINT:
 # # Setup database on startup
 # setup_database()
 
-dynamodb = boto3.resource('dynamodb', **dynamodb_config)
+# Dedicated session with a larger connection pool than botocore's default of 10,
+# so concurrent tool calls don't queue for connections
+session = boto3.Session(**session_config)
+if CONFIG.dax_endpoint:
+    # DAX has the same API as DynamoDB and serves repeat reads from its
+    # cluster cache, shared by every server instance
+    from amazondax import AmazonDaxClient
+    dynamodb = AmazonDaxClient.resource(session=session, endpoint_url=CONFIG.dax_endpoint)
+else:
+    dynamodb = session.resource(
+        'dynamodb',
+        config=BotoConfig(
+            max_pool_connections=50,
+            retries={'mode': 'adaptive', 'max_attempts': 10},
+            tcp_keepalive=True
+        ),
+        **dynamodb_config
+    )
 
 print("✅ ArxivExplorer server initialized with DynamoDB.")
 
 # Get table references
 papers_table = dynamodb.Table('papers')
 searches_table = dynamodb.Table('searches')
+tables = {'papers': papers_table, 'searches': searches_table}
 
-# --- Helper Functions ---
-def save_paper(title: str, url: str, summary: str = None):
-    """Save paper to database."""
-    papers_table.put_item(
-        Item={
-            'url': url,
-            'title': title,
-            'summary': summary,
-            'timestamp': datetime.now().isoformat()
+# --- In-process Cache ---
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def add(self, key, value):
+        """Set `key` only if it has no live entry, so a slow read can't replace a newer write."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] >= time.monotonic():
+                return
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+# Hot paper records, so repeat summarize calls skip the DynamoDB round trip
+paper_cache = TTLCache(maxsize=1024, ttl=300)
+
+# --- Known URL Filter ---
+class BloomFilter:
+    """
+    Fixed-size Bloom filter. Membership tests can return false positives
+    (at roughly `error_rate` up to `capacity` keys) but never false negatives.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8]), int.from_bytes(digest[8:])
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key: str):
+        with self._lock:
+            for pos in self._positions(key):
+                self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+# URLs stored in the papers table, so get_paper skips GetItem for unseen URLs.
+# Only trusted for misses once warm_known_urls() has loaded the table. URLs
+# stored later by other instances look unseen, so summarize_paper would pay
+# for a new summary and overwrite theirs; with DAX (the multi-instance setup)
+# the filter is never loaded and every lookup goes to the cache cluster.
+known_urls = BloomFilter(capacity=100_000, error_rate=0.01)
+known_urls_ready = threading.Event()
+
+def warm_known_urls():
+    """Load every stored paper URL into the Bloom filter."""
+    scan_kwargs = {
+        'ProjectionExpression': '#u',
+        'ExpressionAttributeNames': {'#u': 'url'}
+    }
+    try:
+        while True:
+            response = papers_table.scan(**scan_kwargs)
+            for item in response.get('Items', []):
+                known_urls.add(item['url'])
+            if 'LastEvaluatedKey' not in response:
+                break
+            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        known_urls_ready.set()
+        print("✅ Known paper URL filter loaded")
+    except Exception as e:
+        print(f"❌ Error loading known paper URLs, filter disabled: {e}")
+
+def maybe_stored(url: str) -> bool:
+    """False only when the URL is definitely not in the papers table."""
+    return not known_urls_ready.is_set() or url in known_urls
+
+if not CONFIG.dax_endpoint:
+    threading.Thread(target=warm_known_urls, name="known-urls-warmup", daemon=True).start()
+
+# --- Write-behind Queue ---
+# Tools return as soon as writes are queued; a background thread flushes
+# them every WRITE_BATCH_SIZE items or WRITE_FLUSH_INTERVAL, sending puts
+# with BatchWriteItem and updates as concurrent UpdateItem calls
+write_queue = queue.Queue(maxsize=10_000)
+# Concurrent BatchWriteItem requests, kept well under the 50-connection pool
+WRITE_WORKERS = 8
+write_executor = ThreadPoolExecutor(max_workers=WRITE_WORKERS, thread_name_prefix="batch-write")
+# A backlog is flushed as up to WRITE_WORKERS parallel 25-item chunks
+WRITE_BATCH_SIZE = 25 * WRITE_WORKERS
+WRITE_FLUSH_INTERVAL = 0.2  # seconds
+flusher_stop = threading.Event()
+
+def enqueue_write(write: Tuple[str, str, Dict]) -> bool:
+    """Queue one ('put' | 'update', table_name, payload) write; False if dropped."""
+    try:
+        write_queue.put_nowait(write)
+        return True
+    except queue.Full:
+        print(f"⚠️ Write queue full, dropping {write[0]} to {write[1]}")
+        return False
+
+def queue_summary(url: str, summary: str, existing: Optional[Dict] = None,
+                  title: str = "Unknown Title") -> bool:
+    """
+    Queue a summary update for a paper. It goes through the same FIFO queue
+    as search-result upserts, so writes to one paper land in the order they
+    were made. Title and timestamp are only set if missing. An empty
+    summary is neither stored nor cached, so the paper is retried later;
+    returns False whenever nothing was queued.
+    """
+    if not summary:
+        return False
+    now = utc_now()
+    update = {
+        'Key': {'url': url},
+        'UpdateExpression': (
+            'SET summary = :summary, has_summary = :has_summary, '
+            'title = if_not_exists(title, :title), '
+            '#ts = if_not_exists(#ts, :now)'
+        ),
+        'ExpressionAttributeNames': {'#ts': 'timestamp'},
+        'ExpressionAttributeValues': {
+            ':summary': summary,
+            ':has_summary': bool(summary),
+            ':title': title,
+            ':now': now
         }
-    )
+    }
+    if not enqueue_write(('update', 'papers', update)):
+        return False
+    item = {'url': url, 'title': title, 'timestamp': now, **(existing or {})}
+    item.update(summary=summary, has_summary=bool(summary))
+    paper_cache.set(url, item)
+    known_urls.add(url)
+    return True
+
+def flush_writes():
+    """Drain the write queue in batches until the server shuts down."""
+    while not (flusher_stop.is_set() and write_queue.empty()):
+        try:
+            batch = [write_queue.get(timeout=WRITE_FLUSH_INTERVAL)]
+        except queue.Empty:
+            continue
+        deadline = time.monotonic() + WRITE_FLUSH_INTERVAL
+        while len(batch) < WRITE_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(write_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        apply_writes(batch)
+
+def apply_writes(batch: List[Tuple[str, str, Dict]]):
+    """
+    Apply queued writes in queue order: each run of consecutive puts goes out
+    through batch_write and each run of consecutive updates through
+    apply_updates, one run after another.
+    """
+    for op, run in groupby(batch, key=lambda write: write[0]):
+        writes = [(table_name, payload) for _, table_name, payload in run]
+        if op == 'put':
+            apply_puts(writes)
+        else:
+            apply_updates(writes)
+
+def apply_puts(puts: List[Tuple[str, Dict]]):
+    """batch_write a run of queued puts, logging every key dropped on failure."""
+    if not puts:
+        return
+    try:
+        batch_write(puts)
+    except Exception as e:
+        keys = [f"{table_name}:{item[TABLE_KEYS[table_name]]}" for table_name, item in puts]
+        print(f"❌ Dropped {len(puts)} queued puts ({e}): {', '.join(keys)}")
+
+def apply_updates(updates: List[Tuple[str, Dict]]):
+    """
+    Send a run of queued UpdateItems, several keys at a time. Updates to the
+    same key stay in one group, so they still land in queue order.
+    """
+    groups = {}
+    for table_name, payload in updates:
+        key = (table_name, payload['Key'][TABLE_KEYS[table_name]])
+        groups.setdefault(key, []).append((table_name, payload))
+    map_writes(update_items, list(groups.values()))
+
+def update_items(updates: List[Tuple[str, Dict]]):
+    """Send UpdateItems one by one, logging every update dropped on failure."""
+    for table_name, payload in updates:
+        try:
+            tables[table_name].update_item(**payload)
+        except Exception as e:
+            print(f"❌ Dropped queued update to {table_name} {payload['Key']}: {e}")
+
+def stop_flusher():
+    """Flush pending writes before the process exits (e.g. on SIGTERM)."""
+    flusher_stop.set()
+    flusher.join(timeout=30)
+
+flusher = threading.Thread(target=flush_writes, name="write-flusher", daemon=True)
+flusher.start()
+atexit.register(stop_flusher)
+
+# --- Helper Functions ---
+ULID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"  # Crockford base32
+
+def new_ulid() -> str:
+    """
+    Generate a ULID: a 48-bit millisecond timestamp followed by 80 random
+    bits, so IDs are collision-safe and sort lexicographically by time.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10))
+    return ''.join(ULID_ALPHABET[(value >> shift) & 31] for shift in range(125, -1, -5))
+
+def utc_now() -> str:
+    """Current UTC time as an ISO 8601 string."""
+    return datetime.now(timezone.utc).isoformat()
+
+@dataclass(frozen=True, slots=True)
+class Paper:
+    """A search result. Immutable and slotted to keep result lists small."""
+    title: str
+    url: str
+
+def build_paper_update(url: str, title: str, timestamp: Optional[str] = None) -> Dict:
+    """
+    Build UpdateItem arguments that save a search result. The title is
+    refreshed, the first-seen timestamp is only set if missing and an
+    existing summary is left alone.
+    """
+    return {
+        'Key': {'url': normalize_arxiv_url(url)},
+        'UpdateExpression': 'SET title = :title, #ts = if_not_exists(#ts, :now)',
+        'ExpressionAttributeNames': {'#ts': 'timestamp'},
+        'ExpressionAttributeValues': {':title': title, ':now': timestamp or utc_now()}
+    }
+
+def batch_save_papers(papers: List[Paper], search_item: Optional[Dict] = None,
+                      timestamp: Optional[str] = None):
+    """
+    Queue papers (and optionally a search record) to be saved together.
+    Papers are upserted rather than put, so searching for a stored paper
+    again never erases its summary.
+    """
+    now = timestamp or utc_now()
+    for p in papers:
+        update = build_paper_update(p.url, p.title, now)
+        if enqueue_write(('update', 'papers', update)):
+            known_urls.add(update['Key']['url'])
+    if search_item:
+        enqueue_write(('put', 'searches', search_item))
+
+# Primary key attribute of each table, used to de-duplicate batched puts
+TABLE_KEYS = {'papers': 'url', 'searches': 'search_id'}
+
+def batch_write(writes: List[Tuple[str, Dict]]):
+    """
+    Put (table_name, item) pairs with BatchWriteItem.
+    Requests are sent in 25-item chunks and UnprocessedItems are retried
+    with exponential backoff.
+    """
+    # BatchWriteItem rejects duplicate keys within a single request
+    unique_writes = {
+        (table_name, item[TABLE_KEYS[table_name]]): (table_name, item)
+        for table_name, item in writes
+    }
+    requests = list(unique_writes.values())
+    chunks = [requests[start:start + 25] for start in range(0, len(requests), 25)]
+
+    map_writes(write_chunk, chunks)
+
+def map_writes(send, groups: List[List[Tuple[str, Dict]]]):
+    """
+    Call send on each independent group of writes, concurrently when there
+    are several. At interpreter exit the executor is already shut down, so
+    the final drain sends them inline instead.
+    """
+    if len(groups) > 1 and not flusher_stop.is_set():
+        try:
+            list(write_executor.map(send, groups))
+            return
+        except RuntimeError:
+            pass
+    for group in groups:
+        send(group)
+
+def write_chunk(chunk: List[Tuple[str, Dict]]):
+    """Send one BatchWriteItem request, retrying any UnprocessedItems."""
+    request_items = {}
+    for table_name, item in chunk:
+        request_items.setdefault(table_name, []).append({'PutRequest': {'Item': item}})
+
+    delay = 0.05
+    while request_items:
+        response = dynamodb.batch_write_item(RequestItems=request_items)
+        request_items = response.get('UnprocessedItems') or {}
+        if request_items:
+            time.sleep(delay)
+            delay = min(delay * 2, 2)
 
 def get_paper(url: str) -> Optional[Dict]:
-    """Get paper from database."""
+    """Get paper from cache, falling back to the database."""
+    url = normalize_arxiv_url(url)
+    cached = paper_cache.get(url)
+    if cached is not None:
+        return cached
+    if not maybe_stored(url):
+        return None
     try:
         response = papers_table.get_item(Key={'url': url})
-        return response.get('Item')
     except Exception:
         return None
+    item = response.get('Item')
+    if item:
+        paper_cache.add(url, item)
+    return paper_cache.get(url) or item
 
-def save_search(query: str, results: List[Dict]):
-    """Save search results to database."""
-    search_id = f"{query}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-    searches_table.put_item(
-        Item={
-            'search_id': search_id,
-            'query': query,
-            'results': results,
-            'timestamp': datetime.now().isoformat()
+def batch_get_papers(urls: List[str]) -> Dict[str, Dict]:
+    """
+    Get many papers at once, keyed by normalized URL.
+    Cache misses are fetched with BatchGetItem in 100-key chunks and
+    UnprocessedKeys are retried with exponential backoff.
+    """
+    papers = {}
+    missing = []
+    for url in dict.fromkeys(normalize_arxiv_url(u) for u in urls):
+        cached = paper_cache.get(url)
+        if cached is not None:
+            papers[url] = cached
+        else:
+            # No Bloom filter shortcut: one BatchGetItem already covers 100
+            # keys, and it picks up papers stored by other server instances
+            missing.append(url)
+
+    for start in range(0, len(missing), 100):
+        request_items = {
+            'papers': {'Keys': [{'url': url} for url in missing[start:start + 100]]}
         }
-    )
-    return search_id
-
-# --- Dynamic Resource: Suggested AI research topics ---
-@mcp.resource("resource://ai/arxiv_topics")
-def arxiv_topics() -> List[str]:
-    return [
-        "Transformer interpretability",
-        "Efficient large-scale model training",
-        "Federated learning privacy",
-        "Neural network pruning",
-        "Multi-modal AI systems",
-        "AI safety and alignment"
-    ]
+        delay = 0.05
+        while request_items:
+            response = dynamodb.batch_get_item(RequestItems=request_items)
+            for item in response.get('Responses', {}).get('papers', []):
+                paper_cache.add(item['url'], item)
+                papers[item['url']] = paper_cache.get(item['url']) or item
+            request_items = response.get('UnprocessedKeys') or {}
+            if request_items:
+                time.sleep(delay)
+                delay = min(delay * 2, 2)
+
+    return papers
+
+def build_search_item(query: str, results: List[Paper],
+                      timestamp: Optional[str] = None) -> Dict:
+    """Build a search history record."""
+    return {
+        'search_id': new_ulid(),
+        'entity_type': 'search',
+        'query': query,
+        'results': [asdict(p) for p in results],
+        'result_count': len(results),
+        'timestamp': timestamp or utc_now()
+    }
+
+# --- Static Resource: Suggested AI research topics ---
+TOPICS = (
+    "Transformer interpretability",
+    "Efficient large-scale model training",
+    "Federated learning privacy",
+    "Neural network pruning",
+    "Multi-modal AI systems",
+    "AI safety and alignment"
+)
+# Serialized once; the ETag lets clients skip re-reading an unchanged list
+TOPICS_JSON = json.dumps(TOPICS)
+TOPICS_ETAG = hashlib.sha256(TOPICS_JSON.encode()).hexdigest()
+
+@mcp.resource(
+    "resource://ai/arxiv_topics",
+    mime_type="application/json",
+    meta={
+        "etag": TOPICS_ETAG,
+        "cache_control": "public, max-age=86400, immutable"
+    }
+)
+def arxiv_topics() -> str:
+    return TOPICS_JSON
+
+ARXIV_SITE_FILTER = "site:arxiv.org "
+
+# Recent Tavily results by (query, max_results); identical searches skip Tavily
+search_cache = TTLCache(maxsize=2048, ttl=3600)
+
+async def search_papers(query: str, max_results: int) -> Tuple[Paper, ...]:
+    """Search ArXiv via Tavily, reusing cached results for repeat queries."""
+    key = (query, max_results)
+    papers = search_cache.get(key)
+    if papers is None:
+        resp = await tavily.search(
+            query=ARXIV_SITE_FILTER + query,
+            max_results=max_results
+        )
+        papers = tuple(
+            Paper(title=r["title"].strip(), url=normalize_arxiv_url(r["url"]))
+            for r in resp.get("results", [])
+        )
+        search_cache.set(key, papers)
+    return papers
 
 # --- Enhanced Tool: Search ArXiv with caching ---
 @mcp.tool(annotations={"title": "Search Arxiv"})
-def search_arxiv(query: str, max_results: int = 5) -> List[Dict]:
+async def search_arxiv(query: str, max_results: int = 5) -> List[Paper]:
     """
     Queries ArXiv via Tavily, returning title + link for each paper.
     Results are cached in DynamoDB for future reference.
     """
     print(f"🔍 Searching ArXiv for: {query}")
     
-    resp = tavily.search(
-        query=f"site:arxiv.org {query}",
-        max_results=max_results
-    )
-    
-    results = []
-    for r in resp.get("results", []):
-        paper_data = {
-            "title": r["title"].strip(), 
-            "url": r["url"]
-        }
-        results.append(paper_data)
-        
-        # Save to database
-        save_paper(paper_data["title"], paper_data["url"])
+    results = list(await search_papers(query, max_results))
     
-    # Save search history
-    search_id = save_search(query, results)
-    print(f"✅ Search saved with ID: {search_id}")
+    # Save papers and search history in one batch, sharing one timestamp
+    now = utc_now()
+    search_item = build_search_item(query, results, now)
+    batch_save_papers(results, search_item, now)
+    print(f"✅ Search queued with ID: {search_item['search_id']}")
     
     return results
 
+SUMMARY_PROMPT = "Summarize the key contributions of this ArXiv paper: {url}"
+# Concurrent Tavily calls per summarize_papers request
+SUMMARY_CONCURRENCY = 4
+
 # --- Enhanced Tool: Summarize with caching ---
 @mcp.tool(annotations={"title": "Summarize Paper"})
-def summarize_paper(paper_url: str) -> str:
+async def summarize_paper(paper_url: str) -> str:
     """
     Returns a summary of the paper. Checks cache first, then generates new summary.
     """
+    paper_url = normalize_arxiv_url(paper_url)
     print(f"📝 Summarizing paper: {paper_url}")
     
     # Check if we already have a summary
-    cached_paper = get_paper(paper_url)
+    cached_paper = await asyncio.to_thread(get_paper, paper_url)
     if cached_paper and cached_paper.get('summary'):
         print("✅ Using cached summary")
         return cached_paper['summary']
     
     # Generate new summary
-    prompt = f"Summarize the key contributions of this ArXiv paper: {paper_url}"
-    summary = tavily.qna_search(query=prompt)
+    summary = await tavily.qna_search(query=SUMMARY_PROMPT.format(url=paper_url))
     
-    # Update the paper record with summary
-    if cached_paper:
-        papers_table.update_item(
-            Key={'url': paper_url},
-            UpdateExpression='SET summary = :summary',
-            ExpressionAttributeValues={':summary': summary}
-        )
+    # Queue the upsert behind any pending writes, keeping existing title/timestamp
+    if queue_summary(paper_url, summary, cached_paper):
+        print("✅ Summary generated and cached")
     else:
-        # Create new record if paper doesn't exist
-        save_paper("Unknown Title", paper_url, summary)
-    
-    print("✅ Summary generated and cached")
+        print("⚠️ Summary not cached")
     return summary
 
+def summary_error(error: Exception) -> str:
+    """Short, client-safe reason a summary couldn't be generated."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"Summary request failed (HTTP {error.response.status_code})"
+    if isinstance(error, httpx.TimeoutException):
+        return "Summary request timed out"
+    return "Summary request failed"
+
+# --- New Tool: Summarize several papers at once ---
+@mcp.tool(annotations={"title": "Summarize Papers"})
+async def summarize_papers(paper_urls: List[str]) -> Dict[str, Dict[str, str]]:
+    """
+    Summarizes several papers at once. Cached summaries are fetched in one
+    batch and missing ones are generated concurrently.
+    Returns {"summaries": {url: summary}, "errors": {url: reason}}; every
+    normalized URL appears in exactly one of the two maps.
+    """
+    urls = list(dict.fromkeys(normalize_arxiv_url(u) for u in paper_urls))
+    print(f"📝 Summarizing {len(urls)} papers")
+    
+    papers = await asyncio.to_thread(batch_get_papers, urls)
+    missing = [u for u in urls if not papers.get(u, {}).get('summary')]
+    
+    # Generate missing summaries concurrently, a few Tavily calls at a time
+    semaphore = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+    
+    async def summarize(url: str) -> str:
+        async with semaphore:
+            return await tavily.qna_search(query=SUMMARY_PROMPT.format(url=url))
+    
+    results = await asyncio.gather(*[summarize(u) for u in missing], return_exceptions=True)
+    
+    summaries = {url: papers[url]['summary'] for url in urls if url not in missing}
+    errors = {}
+    for url, result in zip(missing, results):
+        if isinstance(result, Exception):
+            # One failed paper (e.g. a 429) doesn't discard the others
+            print(f"❌ Error summarizing {url}: {result}")
+            errors[url] = summary_error(result)
+            continue
+        if not result:
+            errors[url] = "No summary returned"
+            continue
+        existing = papers.get(url)
+        queue_summary(url, result, existing, (existing or {}).get('title', "Unknown Title"))
+        summaries[url] = result
+    
+    print(f"✅ {len(urls) - len(missing)} cached, {len(missing) - len(errors)} generated, {len(errors)} failed")
+    return {
+        'summaries': {url: summaries[url] for url in urls if url in summaries},
+        'errors': errors
+    }
+
 # --- New Tool: Get Search History ---
 @mcp.tool(annotations={"title": "Get Search History"})
-def get_search_history(limit: int = 10) -> List[Dict]:
+async def get_search_history(limit: int = 10) -> List[Dict]:
     """
     Returns recent search history from the database.
     """
     try:
-        response = searches_table.scan(Limit=limit)
+        # Query the timestamp index newest-first instead of scanning the table
+        response = await asyncio.to_thread(
+            searches_table.query,
+            IndexName='by_timestamp',
+            KeyConditionExpression=Key('entity_type').eq('search'),
+            ScanIndexForward=False,
+            Limit=limit,
+            ProjectionExpression='search_id, #q, #ts, result_count',
+            ExpressionAttributeNames={'#q': 'query', '#ts': 'timestamp'}
+        )
         items = response.get('Items', [])
         
-        # Sort by timestamp (most recent first)
-        sorted_items = sorted(items, key=lambda x: x['timestamp'], reverse=True)
-        
         return [{
             'search_id': item['search_id'],
             'query': item['query'],
             'timestamp': item['timestamp'],
-            'result_count': len(item.get('results', []))
-        } for item in sorted_items]
+            'result_count': int(item['result_count'])
+        } for item in items]
+    except ClientError as e:
+        error = e.response.get('Error', {})
+        if error.get('Code') == 'ValidationException' and 'index' in error.get('Message', ''):
+            raise ToolError(
+                "Search history index 'by_timestamp' is missing; "
+                "run migrate_search_history.py"
+            ) from e
+        print(f"❌ Error fetching search history: {e}")
+        return []
     except Exception as e:
         print(f"❌ Error fetching search history: {e}")
         return []
 
 # --- New Tool: Get Saved Papers ---
 @mcp.tool(annotations={"title": "Get Saved Papers"})
-def get_saved_papers(limit: int = 20) -> List[Dict]:
+async def get_saved_papers(limit: int = 20) -> List[Dict]:
     """
     Returns saved papers from the database.
     """
     try:
-        response = papers_table.scan(Limit=limit)
+        # Project only the listed fields so summaries are never transferred
+        response = await asyncio.to_thread(
+            papers_table.scan,
+            Limit=limit,
+            ProjectionExpression='title, #u, has_summary, #ts',
+            ExpressionAttributeNames={'#u': 'url', '#ts': 'timestamp'}
+        )
         items = response.get('Items', [])
         
         return [{
             'title': item['title'],
             'url': item['url'],
-            'has_summary': bool(item.get('summary')),
+            'has_summary': item.get('has_summary', False),
             'timestamp': item['timestamp']
         } for item in items]
     except Exception as e:
@@ -252,13 +801,22 @@ def explore_topic_prompt(topic: str) -> str:
     return (
         f"I want to explore recent work on '{topic}'.\n"
         f"1. Call 'Search Arxiv' to find the 5 most recent papers.\n"
-        f"2. For each paper URL, call 'Summarize Paper' to extract key contributions.\n"
+        f"2. Call 'Summarize Papers' with all paper URLs to extract key contributions "
+        f"(papers under 'errors' could not be summarized).\n"
         f"3. Use 'Get Search History' to see if we've explored similar topics.\n"
         f"4. Combine all information into a comprehensive overview report."
     )
 
 print("✅ Prompt 'explore_topic_prompt' registered.")
 
+async def main():
+    try:
+        await mcp.run_async(transport="http", host="0.0.0.0", port=8080)
+    finally:
+        # Drain queued writes while the batch-write executor is still running
+        await asyncio.to_thread(stop_flusher)
+        await tavily.aclose()
+
 if __name__ == "__main__":
     print("\n🚀 Starting ArxivExplorer Server with DynamoDB...")
-    mcp.run(transport="http", host="0.0.0.0", port=8080)
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
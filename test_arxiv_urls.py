@@ -0,0 +1,29 @@
+from arxiv_urls import normalize_arxiv_url
+
+# (input, expected canonical URL)
+CASES = [
+    ("https://arxiv.org/abs/2401.12345", "https://arxiv.org/abs/2401.12345"),
+    ("https://arxiv.org/abs/2401.12345v2", "https://arxiv.org/abs/2401.12345"),
+    ("http://arxiv.org/pdf/2401.12345v1.pdf", "https://arxiv.org/abs/2401.12345"),
+    ("https://www.arxiv.org/html/2401.12345v3/", "https://arxiv.org/abs/2401.12345"),
+    ("https://export.arxiv.org/abs/hep-th/9901001v1", "https://arxiv.org/abs/hep-th/9901001"),
+    ("arxiv.org/abs/2401.12345", "https://arxiv.org/abs/2401.12345"),
+    ("  https://arxiv.org/abs/2401.12345?utm_source=x#intro ", "https://arxiv.org/abs/2401.12345"),
+    ("https://arxiv.org/list/cs.AI/recent", "https://arxiv.org/list/cs.AI/recent"),
+    ("https://Example.com/paper/?id=7&utm_medium=x&fbclid=1#top", "https://example.com/paper?id=7"),
+    ("example.com/paper", "https://example.com/paper"),
+    ("http://example.com/a?b=&c=2", "http://example.com/a?b=&c=2"),
+]
+
+def test_normalize_arxiv_url():
+    for url, expected in CASES:
+        assert normalize_arxiv_url(url) == expected, url
+
+def test_normalize_arxiv_url_is_idempotent():
+    for _, expected in CASES:
+        assert normalize_arxiv_url(expected) == expected, expected
+
+if __name__ == "__main__":
+    test_normalize_arxiv_url()
+    test_normalize_arxiv_url_is_idempotent()
+    print(f"✅ {len(CASES)} URL normalization cases passed")
@@ -1,5 +1,6 @@
 import ast
 import asyncio
+import json
 import pprint
 
 from fastmcp import Client
@@ -10,24 +11,25 @@ from fastmcp.client.transports import StreamableHttpTransport
 SERVER_URL = "https://3yjaa8aqs3.us-east-1.awsapprunner.com/mcp"
 pp = pprint.PrettyPrinter(indent=2, width=100)
 
-def unwrap_tool_result(resp):
+def unwrap_tool_result(resp, allow_python_literals=False):
     """
     Safely unwraps the content from a FastMCP tool call result object.
+    Set allow_python_literals to also accept Python repr output, which is
+    parsed with the much slower ast.literal_eval.
     """
     if hasattr(resp, "content") and resp.content:
         content_object = resp.content[0]
         
         if hasattr(content_object, "text"):
             try:
-                import json
-                result = json.loads(content_object.text)
-                return result
+                return json.loads(content_object.text)
             except json.JSONDecodeError:
-                try:
-                    result = ast.literal_eval(content_object.text)
-                    return result
-                except (ValueError, SyntaxError):
-                    return content_object.text
+                if allow_python_literals:
+                    try:
+                        return ast.literal_eval(content_object.text)
+                    except (ValueError, SyntaxError):
+                        pass
+                return content_object.text
         
         if hasattr(content_object, "json") and callable(content_object.json):
             return content_object.json()
@@ -86,6 +88,16 @@ async def main():
             summary2 = unwrap_tool_result(raw_summary2)
             print(f"Summary (cached): {summary2[:200]}...")
 
+            # Batch call - cached rows fetched together, the rest generated concurrently
+            print("\n📚 Testing summarize_papers batch retrieval...")
+            raw_summaries = await client.call_tool(
+                "summarize_papers", {"paper_urls": [p["url"] for p in search_results]}
+            )
+            summaries = unwrap_tool_result(raw_summaries)
+            print(f"✅ Retrieved {len(summaries['summaries'])} summaries")
+            for url, reason in summaries['errors'].items():
+                print(f"  ⚠️ {url}: {reason}")
+
         # 5. Test new database tools
         print("\n\n📚 Testing get_saved_papers...")
         raw_papers = await client.call_tool("get_saved_papers", {"limit": 5})